@@ -1,13 +1,49 @@
 from pathlib import Path
+import shlex
 import subprocess
 import sys
 import os
 
+from remote_demo.git_runner import READ_ONLY_ENV, error_text, run_git
+from remote_demo.git_status import STATUS_COMMAND, format_status
+
+# Identity used for the demo commit when the user has not configured one
+DEFAULT_IDENTITY = {
+    "user.email": "example@example.com",
+    "user.name": "Example User",
+}
+
+# Commits a single file: sh -c SCRIPT sh <file> <message> <email> <name>.
+# The fallback identity is passed with -c only for keys git config cannot
+# find. The probe runs inside the batch after git init, so it reads the new
+# repository's config, never an enclosing repository's, and Python spawns
+# no extra process for it.
+# While HEAD is unborn the commit is built with plumbing (update-index,
+# write-tree, commit-tree) instead of porcelain commit. The tree is written
+# from the index, so anything the user already staged is kept in the commit
+# and the index already matches HEAD afterwards. An existing history gets a
+# regular add + commit.
+COMMIT_FILE_SCRIPT = r"""
+file=$1 message=$2 email=$3 name=$4
+set --
+git config user.email >/dev/null || set -- "$@" -c "user.email=$email"
+git config user.name >/dev/null || set -- "$@" -c "user.name=$name"
+if git rev-parse -q --verify HEAD >/dev/null; then
+    git add -- "$file" && git "$@" commit -q -m "$message"
+else
+    git update-index --add -- "$file" &&
+    tree=$(git write-tree) &&
+    commit=$(git "$@" commit-tree -m "$message" "$tree") &&
+    git update-ref HEAD "$commit"
+fi
+"""
+
 class GitOperationError(Exception):
     """Custom exception for Git operation failures"""
     pass
 
-def run_git_command(command, cwd, error_message="Git operation failed"):
+def run_git_command(command, cwd, error_message="Git operation failed", capture=True,
+                    text=True, env=None):
     """
     Safely execute a git command with proper error handling
     
@@ -15,6 +51,9 @@ def run_git_command(command, cwd, error_message="Git operation failed"):
         command (list): Git command as a list of strings
         cwd (Path): Working directory for the command
         error_message (str): Custom error message for failures
+        capture (bool): Capture stdout; when False it is sent to /dev/null
+        text (bool): Decode output to str; when False it is returned as bytes
+        env (dict): Environment for the command; inherited when None
     
     Returns:
         subprocess.CompletedProcess: Result of the command if successful
@@ -23,25 +62,56 @@ def run_git_command(command, cwd, error_message="Git operation failed"):
         GitOperationError: If the command fails
     """
     try:
-        result = subprocess.run(
+        return run_git(
             command,
+            env=env,
             cwd=cwd,
-            check=True,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            text=text
         )
-        return result
     except subprocess.CalledProcessError as e:
-        raise GitOperationError(f"{error_message}: {e.stderr}")
+        raise GitOperationError(f"{error_message}: {error_text(e)}")
     except FileNotFoundError:
         raise GitOperationError("Git executable not found. Please install Git.")
 
-def safe_git_operations(project_path):
+def run_git_batch(commands, cwd, error_message="Git operation failed", capture=True,
+                  env=None):
+    """
+    Execute several git commands in a single shell process
+    
+    The commands are chained with ``&&`` so the batch stops at the first
+    failure, and a NUL byte is printed after each one so the output can be
+    split back into per-command results.
+    
+    Args:
+        commands (list): Git commands, each as a list of strings
+        cwd (Path): Working directory for the commands
+        error_message (str): Custom error message for failures
+        capture (bool): Capture stdout; when False only success is checked
+        env (dict): Environment for the whole batch; inherited when None
+    
+    Returns:
+        list: Standard output of each command as bytes, in order, or None
+        when output is not captured
+        
+    Raises:
+        GitOperationError: If any of the commands fails
+    """
+    script = " && ".join(f"{shlex.join(command)} && printf '\\0'" for command in commands)
+    result = run_git_command(["sh", "-c", script], cwd, error_message, capture,
+                             text=False, env=env)
+    if not capture:
+        return None
+    return result.stdout.split(b"\0")[:-1]
+
+def safe_git_operations(project_path, verbose=False):
     """
     Perform Git operations safely with error handling
     
     Args:
         project_path (Path): Path to the project directory
+        verbose (bool): Print the resulting status and commit log; otherwise
+            their output is discarded and only their success is checked
     """
     try:
         # Ensure directory exists
@@ -49,41 +119,45 @@ def safe_git_operations(project_path):
             print(f"Creating directory: {project_path}")
             project_path.mkdir(parents=True, exist_ok=True)
         
-        # Initialize git repository
-        print("\nInitializing Git repository...")
-        run_git_command(["git", "init"], project_path)
-        
         # Create a sample file
         sample_file = project_path / "sample.txt"
         sample_file.write_text("Hello, Git!")
         
-        # Check status
-        print("\nChecking repository status...")
-        status_result = run_git_command(["git", "status"], project_path)
-        print(status_result.stdout)
-        
-        # Add files to staging
-        print("\nAdding files to staging...")
-        run_git_command(["git", "add", "."], project_path)
-        
-        # Configure git user (if not already configured)
-        try:
-            run_git_command(["git", "config", "user.email", "example@example.com"], project_path)
-            run_git_command(["git", "config", "user.name", "Example User"], project_path)
-        except GitOperationError:
-            print("Warning: Could not configure Git user. Commits may fail.")
-        
-        # Commit changes
-        print("\nCommitting changes...")
-        run_git_command(
-            ["git", "commit", "-m", "Initial commit"],
-            project_path
+        # Initialize, commit and read back status and log in one shell
+        # process rather than spawning a separate process per step. The
+        # commit script falls back to DEFAULT_IDENTITY with -c only for keys
+        # the user has not configured, so .git/config is never written. The
+        # read-only settings only touch optional locks and output flushing,
+        # so they are safe for the writing steps too and spare the reads.
+        print("\nInitializing Git repository and committing changes...")
+        outputs = run_git_batch(
+            [
+                ["git", "init", "-q"],
+                ["sh", "-c", COMMIT_FILE_SCRIPT, "sh", sample_file.name,
+                 "Initial commit", DEFAULT_IDENTITY["user.email"],
+                 DEFAULT_IDENTITY["user.name"]],
+                STATUS_COMMAND,
+                ["git", "log", "--oneline"],
+            ],
+            project_path,
+            capture=verbose,
+            env={**os.environ, **READ_ONLY_ENV}
         )
         
-        # Show commit log
-        print("\nShowing commit log...")
-        log_result = run_git_command(["git", "log", "--oneline"], project_path)
-        print(log_result.stdout)
+        if verbose:
+            _, _, status_output, log_output = outputs
+            
+            # Check status
+            print("\nRepository status after commit:")
+            changes = format_status(status_output)
+            for line in changes:
+                print(line)
+            if not changes:
+                print("No changes to tracked files")
+            
+            # Show commit log
+            print("\nShowing commit log...")
+            print(log_output.decode())
         
     except GitOperationError as e:
         print(f"Error: {e}")
@@ -100,6 +174,6 @@ if __name__ == "__main__":
     project_dir = Path.cwd()
     
     print(f"Starting Git operations in: {project_dir}")
-    success = safe_git_operations(project_dir)
+    success = safe_git_operations(project_dir, verbose="--verbose" in sys.argv[1:])
     
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -4,39 +4,70 @@ Git Branch Operations Example
 This script demonstrates Git branching and merging operations using Python.
 """
 
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
 
+from git_runner import (READ_ONLY_ENV, STREAMING_ENV, ensure_repo, repo_env,
+                        run_git_reporting, stream_git, write_file)
+from git_status import STATUS_COMMAND, format_status
+
 class GitBranchManager:
     def __init__(self, repo_path):
         self.repo_path = Path(repo_path)
+        # Single background worker that starts reading status right after a
+        # merge, the one step the demo follows with a status read, so git's
+        # startup overlaps with the branch listing; call close() when done
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._status_future = None
+        self._work_tree = os.path.abspath(self.repo_path)
+        self._git_env = repo_env(self._work_tree)
+        self._read_env = {**self._git_env, **READ_ONLY_ENV}
+        self._stream_env = {**self._git_env, **STREAMING_ENV}
         self.ensure_repo_exists()
 
-    def run_command(self, command, error_msg=None):
-        """Execute a Git command and return the output"""
-        try:
-            result = subprocess.run(command, cwd=self.repo_path, 
-                                  capture_output=True, text=True, check=True)
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            if error_msg:
-                print(f"{error_msg}: {e.stderr}")
-            else:
-                print(f"Error executing command: {e.stderr}")
-            return None
+    def run_command(self, command, error_msg=None, text=True, env=None):
+        """Execute a Git command and return the output, as bytes if text is False"""
+        return run_git_reporting(command, env or self._git_env, error_msg, text=text)
+
+    def stream_command(self, command, error_msg=None, env=None):
+        """Execute a Git command, printing its output line by line as it arrives"""
+        return stream_git(command, env or self._git_env, error_msg)
+
+    def run_silent(self, command, error_msg=None):
+        """Execute a Git command whose output is not needed and report success"""
+        return run_git_reporting(command, self._git_env, error_msg,
+                                 stdout=subprocess.DEVNULL, text=False) is not None
+
+    def _prefetch_status(self):
+        """Start reading the status in the background"""
+        self._status_future = self._pool.submit(self.run_command, STATUS_COMMAND,
+                                                "Failed to show status", text=False,
+                                                env=self._read_env)
+
+    def close(self):
+        """Shut down the background status worker"""
+        self._pool.shutdown()
+
+    def _invalidate_status(self):
+        """Drop a prefetched status that the next change would make stale"""
+        self._status_future = None
 
     def ensure_repo_exists(self):
         """Ensure we're in a Git repository"""
-        if not self.repo_path.exists():
-            self.repo_path.mkdir(parents=True)
-        if not (self.repo_path / ".git").exists():
-            self.run_command(["git", "init"], "Failed to initialize repository")
+        ensure_repo(self._work_tree, self._init_repo)
+
+    def _init_repo(self):
+        """Initialize the repository"""
+        return self.run_silent(["git", "init"], "Failed to initialize repository")
 
     def create_branch(self, branch_name):
         """Create and switch to a new branch"""
         print(f"\nCreating branch: {branch_name}")
+        self._invalidate_status()
         result = self.run_command(["git", "checkout", "-b", branch_name],
                                 f"Failed to create branch {branch_name}")
         return result is not None
@@ -44,60 +75,86 @@ class GitBranchManager:
     def switch_branch(self, branch_name):
         """Switch to an existing branch"""
         print(f"\nSwitching to branch: {branch_name}")
+        self._invalidate_status()
         result = self.run_command(["git", "checkout", branch_name],
                                 f"Failed to switch to branch {branch_name}")
         return result is not None
 
     def create_file(self, filename, content):
-        """Create a file with specified content"""
+        """Create a file with specified content and return its repo-relative path"""
+        self._invalidate_status()
         file_path = self.repo_path / filename
-        file_path.write_text(content)
-        return file_path.exists()
-
-    def commit_changes(self, message):
-        """Stage and commit changes"""
-        self.run_command(["git", "add", "."], "Failed to stage changes")
-        result = self.run_command(["git", "commit", "-m", message],
-                                "Failed to commit changes")
-        return result is not None
+        if write_file(file_path, content):
+            # Intent-to-add lets `git commit --include` accept the new path
+            self.run_silent(["git", "add", "-N", filename],
+                            f"Failed to track {filename}")
+        return str(file_path.relative_to(self.repo_path))
+
+    def commit_changes(self, message, paths):
+        """Stage the given paths and commit them in one step"""
+        self._invalidate_status()
+        return self.run_silent(["git", "commit", "--include", "-m", message,
+                                "--", *paths],
+                               "Failed to commit changes")
 
     def merge_branch(self, source_branch):
         """Merge source branch into current branch"""
         print(f"\nMerging {source_branch} into current branch")
+        self._invalidate_status()
         result = self.run_command(["git", "merge", source_branch],
                                 f"Failed to merge {source_branch}")
+        if result is not None:
+            self._prefetch_status()
         return result is not None
 
     def show_branch_status(self):
         """Show current branch and status"""
         print("\nCurrent branch status:")
-        self.run_command(["git", "branch"], "Failed to show branches")
-        self.run_command(["git", "status"], "Failed to show status")
+        # for-each-ref is plumbing: unlike `git branch` it does not consult
+        # pager, column or color settings before listing the refs
+        self.stream_command(
+            ["git", "for-each-ref", "--format=%(HEAD) %(refname:short)", "refs/heads"],
+            "Failed to show branches", env=self._stream_env)
+        if self._status_future is not None:
+            # A prefetch answers one read only; later reads query git again
+            status = self._status_future.result()
+            self._status_future = None
+        else:
+            status = self.run_command(STATUS_COMMAND, "Failed to show status",
+                                      text=False, env=self._read_env)
+        if status is not None:
+            changes = format_status(status)
+            for line in changes:
+                print(line)
+            if not changes:
+                print("No changes to tracked files")
 
 def demonstrate_branching():
     """Demonstrate Git branching operations"""
     manager = GitBranchManager("branch_demo")
-
-    # Create main branch content
-    print("\nCreating main branch content...")
-    manager.create_file("main.txt", "Main branch content")
-    manager.commit_changes("Initial commit on main")
-
-    # Create and work on feature branch
-    manager.create_branch("feature")
-    manager.create_file("feature.txt", "Feature branch content")
-    manager.commit_changes("Add feature")
-
-    # Switch back to main and create parallel changes
-    manager.switch_branch("main")
-    manager.create_file("parallel.txt", "Parallel main branch work")
-    manager.commit_changes("Parallel work on main")
-
-    # Merge feature into main
-    manager.merge_branch("feature")
-    
-    # Show final status
-    manager.show_branch_status()
+    try:
+        # Create main branch content
+        print("\nCreating main branch content...")
+        main_file = manager.create_file("main.txt", "Main branch content")
+        manager.commit_changes("Initial commit on main", [main_file])
+
+        # Create and work on feature branch
+        manager.create_branch("feature")
+        feature_file = manager.create_file("feature.txt", "Feature branch content")
+        manager.commit_changes("Add feature", [feature_file])
+
+        # Switch back to main and create parallel changes
+        manager.switch_branch("main")
+        parallel_file = manager.create_file("parallel.txt", "Parallel main branch work")
+        manager.commit_changes("Parallel work on main", [parallel_file])
+
+        # Merge feature into main
+        manager.merge_branch("feature")
+
+        # Show final status
+        manager.show_branch_status()
+    finally:
+        manager.close()
 
 if __name__ == "__main__":
     demonstrate_branching() 
\ No newline at end of file
@@ -4,47 +4,56 @@ Git Merge Conflict Resolution Example
 This script demonstrates how to handle merge conflicts in Git using Python.
 """
 
+import os
 import subprocess
 import sys
 from pathlib import Path
 
+from git_runner import ensure_repo, repo_env, run_git_reporting, write_file
+
 class GitConflictResolver:
     def __init__(self, repo_path):
         self.repo_path = Path(repo_path)
+        self._work_tree = os.path.abspath(self.repo_path)
+        self._git_env = repo_env(self._work_tree)
         self.setup_repository()
 
     def run_command(self, command):
         """Execute a Git command and return the output"""
-        try:
-            result = subprocess.run(command, cwd=self.repo_path,
-                                  capture_output=True, text=True, check=True)
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            print(f"Git command failed: {e.stderr}")
-            return None
+        return run_git_reporting(command, self._git_env, "Git command failed")
+
+    def run_silent(self, command):
+        """Execute a Git command whose output is not needed and report success"""
+        return run_git_reporting(command, self._git_env, "Git command failed",
+                                 stdout=subprocess.DEVNULL, text=False) is not None
 
     def setup_repository(self):
         """Set up a new repository for conflict demonstration"""
-        if not self.repo_path.exists():
-            self.repo_path.mkdir(parents=True)
-        
-        if not (self.repo_path / ".git").exists():
-            self.run_command(["git", "init"])
-            print("Initialized new Git repository")
+        ensure_repo(self._work_tree, self._init_repo)
+
+    def _init_repo(self):
+        """Initialize the repository and announce it"""
+        if not self.run_silent(["git", "init"]):
+            return False
+        print("Initialized new Git repository")
+        return True
 
     def create_file(self, filename, content):
-        """Create or update a file with given content"""
+        """Create or update a file with given content and return its repo-relative path"""
         file_path = self.repo_path / filename
-        file_path.write_text(content)
+        if write_file(file_path, content):
+            # Intent-to-add lets `git commit --include` accept the new path
+            self.run_silent(["git", "add", "-N", filename])
         print(f"Created/Updated {filename}")
+        return str(file_path.relative_to(self.repo_path))
 
-    def commit_changes(self, message):
-        """Stage and commit changes"""
-        self.run_command(["git", "add", "."])
-        result = self.run_command(["git", "commit", "-m", message])
-        if result:
+    def commit_changes(self, message, paths):
+        """Stage the given paths and commit them in one step"""
+        committed = self.run_silent(["git", "commit", "--include", "-m", message,
+                                     "--", *paths])
+        if committed:
             print(f"Committed changes: {message}")
-        return result is not None
+        return committed
 
     def create_branch(self, branch_name):
         """Create and switch to a new branch"""
@@ -72,9 +81,9 @@ class GitConflictResolver:
 
     def resolve_conflict(self, filename, resolution):
         """Resolve a merge conflict in a file"""
-        self.create_file(filename, resolution)
-        self.run_command(["git", "add", filename])
-        self.commit_changes("Resolve merge conflict")
+        path = self.create_file(filename, resolution)
+        # Committing the resolved path stages it and concludes the merge
+        self.commit_changes("Resolve merge conflict", [path])
         print(f"Resolved conflict in {filename}")
 
 def demonstrate_conflict_resolution():
@@ -83,18 +92,18 @@ def demonstrate_conflict_resolution():
 
     # Create initial file
     print("\nCreating initial file...")
-    resolver.create_file("shared.txt", "Initial content")
-    resolver.commit_changes("Initial commit")
+    shared_file = resolver.create_file("shared.txt", "Initial content")
+    resolver.commit_changes("Initial commit", [shared_file])
 
     # Create feature branch
     resolver.create_branch("feature")
     resolver.create_file("shared.txt", "Feature branch changes")
-    resolver.commit_changes("Feature branch modifications")
+    resolver.commit_changes("Feature branch modifications", [shared_file])
 
     # Switch back to main and make conflicting changes
     resolver.switch_branch("main")
     resolver.create_file("shared.txt", "Main branch changes")
-    resolver.commit_changes("Main branch modifications")
+    resolver.commit_changes("Main branch modifications", [shared_file])
 
     # Try to merge feature branch
     print("\nAttempting to merge feature branch...")
@@ -0,0 +1,201 @@
+"""
+Shared Git Command Runner
+This module starts the git processes for every demo script, so the
+subprocess settings live in one place, and holds the small repository
+and file helpers the scripts share.
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+
+# Resolved once, so subprocess is handed an executable with a directory.
+# Together with close_fds=False and no cwd= that lets CPython start git
+# with posix_spawn instead of fork + exec. None if git is not installed,
+# in which case spawning fails with FileNotFoundError as usual.
+GIT_EXECUTABLE = shutil.which("git")
+
+# Environment for read-only queries whose output is streamed: skip optional
+# locks such as the index refresh write, so reads never contend with a
+# concurrent git process
+STREAMING_ENV = {"GIT_OPTIONAL_LOCKS": "0"}
+
+# Environment for read-only queries whose output is read in one piece: also
+# let git fully buffer its output into our pipes instead of flushing per
+# record. Not for streamed commands, whose lines would then arrive in bulk
+READ_ONLY_ENV = {**STREAMING_ENV, "GIT_FLUSH": "0"}
+
+def repo_env(work_tree, base=None):
+    """
+    Build an environment that points git at the repository in work_tree
+
+    GIT_DIR/GIT_WORK_TREE replace cwd=, so children skip the chdir and the
+    upward search for .git; pathspecs are then taken relative to the top of
+    the work tree.
+
+    Args:
+        work_tree (str): Absolute path of the repository's work tree
+        base (dict): Environment to extend; os.environ when None
+
+    Returns:
+        dict: A new environment for the repository's git commands
+    """
+    return {**(os.environ if base is None else base),
+            "GIT_DIR": os.path.join(work_tree, ".git"), "GIT_WORK_TREE": work_tree}
+
+# Absolute work trees of repositories already known to be initialized in
+# this process, shared by every manager; lets repeated manager construction
+# skip the filesystem probes
+_REPO_INIT_CACHE = set()
+
+def ensure_repo(work_tree, init):
+    """
+    Make sure work_tree exists and holds a Git repository
+
+    The cache is keyed on the caller's already resolved work tree: abspath
+    calls getcwd() for relative paths, so it is not recomputed per lookup.
+
+    Args:
+        work_tree (str): Absolute path of the repository's work tree
+        init (callable): Initializes the repository, returning True on success
+
+    Returns:
+        bool: True if the repository is initialized
+    """
+    if work_tree in _REPO_INIT_CACHE:
+        return True
+    os.makedirs(work_tree, exist_ok=True)
+    if not os.path.exists(os.path.join(work_tree, ".git")) and not init():
+        return False
+    _REPO_INIT_CACHE.add(work_tree)
+    return True
+
+def clear_repo_cache():
+    """Forget which repositories are initialized, e.g. after deleting one"""
+    _REPO_INIT_CACHE.clear()
+
+def _executable(command):
+    """Return the resolved path for git commands, None for anything else"""
+    return GIT_EXECUTABLE if command[0] == "git" else None
+
+def run_git(command, env=None, cwd=None, stdout=subprocess.PIPE, text=True,
+            check=True):
+    """
+    Run a command to completion, always capturing stderr
+
+    Args:
+        command (list): Command as a list of strings
+        env (dict): Environment for the command; inherited when None
+        cwd (Path): Working directory; inherited when None
+        stdout: subprocess.PIPE to capture, DEVNULL to discard or None to
+            let the output go straight to the terminal
+        text (bool): Decode output to str instead of returning bytes
+        check (bool): Raise CalledProcessError on a non-zero exit status
+
+    Returns:
+        subprocess.CompletedProcess: Result of the command
+    """
+    # close_fds=False is safe for these short-lived git children: Python opens
+    # its own descriptors as non-inheritable (PEP 446), so nothing leaks.
+    # stream_git and run_git_async pass it for the same reason.
+    return subprocess.run(command, executable=_executable(command), env=env,
+                          cwd=cwd, close_fds=False, stdout=stdout,
+                          stderr=subprocess.PIPE, text=text, check=check)
+
+def report_failure(error_msg, stderr):
+    """Print a failed command's stderr under error_msg or a generic heading"""
+    print(f"{error_msg or 'Error executing command'}: {stderr}")
+
+def run_git_reporting(command, env=None, error_msg=None, stdout=subprocess.PIPE,
+                      text=True):
+    """
+    Run a command to completion, printing its stderr instead of raising
+
+    Args:
+        command (list): Command as a list of strings
+        env (dict): Environment for the command; inherited when None
+        error_msg (str): Heading for the printed failure
+        stdout: subprocess.PIPE to capture, DEVNULL to discard or None to
+            let the output go straight to the terminal
+        text (bool): Decode output to str instead of returning bytes
+
+    Returns:
+        The stripped output when stdout is captured, an empty string when it
+        is not, or None if the command failed
+    """
+    # With stdout=DEVNULL and text=False, quiet commands skip a pipe and the
+    # text decoding; stderr is only decoded when the command fails
+    try:
+        result = run_git(command, env=env, stdout=stdout, text=text)
+    except subprocess.CalledProcessError as e:
+        report_failure(error_msg, error_text(e))
+        return None
+    return result.stdout.strip() if stdout == subprocess.PIPE else ""
+
+def stream_git(command, env=None, error_msg=None):
+    """
+    Run a command, printing its stdout line by line as it arrives
+
+    stderr goes to an anonymous temporary file instead of a second pipe: a
+    child that filled an unread stderr pipe while we were still reading
+    stdout would block, and each side would wait on the other forever.
+
+    Args:
+        command (list): Command as a list of strings
+        env (dict): Environment for the command; inherited when None
+        error_msg (str): Heading for the printed failure
+
+    Returns:
+        bool: True if the command succeeded
+    """
+    with tempfile.TemporaryFile() as errors:
+        with subprocess.Popen(command, executable=_executable(command), env=env,
+                              close_fds=False, stdout=subprocess.PIPE,
+                              stderr=errors, text=True, bufsize=1) as proc:
+            for line in proc.stdout:
+                print(line, end="")
+        if proc.returncode != 0:
+            errors.seek(0)
+            report_failure(error_msg, errors.read().decode(errors="replace"))
+            return False
+    return True
+
+async def run_git_async(command, env=None, error_msg=None):
+    """Run a command on the event loop; return its stripped output, or None on failure"""
+    program = _executable(command) or command[0]
+    proc = await asyncio.create_subprocess_exec(
+        program, *command[1:], env=env, close_fds=False,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        report_failure(error_msg, stderr.decode(errors="replace"))
+        return None
+    return stdout.decode().strip()
+
+def error_text(error):
+    """Return the stderr of a failed command as text"""
+    stderr = error.stderr
+    if isinstance(stderr, bytes):
+        stderr = stderr.decode(errors="replace")
+    return stderr
+
+def write_file(path, content):
+    """Write content to path and report whether the file was newly created"""
+    # Raw os.open/os.write: O_EXCL reports whether the file is new, which
+    # saves the separate exists() stat, and there is no file object to set up
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        created = True
+    except FileExistsError:
+        fd = os.open(path, os.O_WRONLY | os.O_TRUNC)
+        created = False
+    try:
+        # os.write may write less than asked, so keep going from where it stopped
+        data = memoryview(content.encode())
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+    return created
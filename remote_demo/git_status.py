@@ -0,0 +1,48 @@
+"""
+Shared Git Status Parsing
+This module holds the status query and its parser used by the demo
+scripts, so every script reports changes the same way.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+# Machine-readable status that skips the untracked-file scan and does not
+# take the optional index lock just to refresh stat information
+STATUS_COMMAND = ["git", "--no-optional-locks", "status",
+                  "--porcelain=v2", "--untracked-files=no"]
+
+# One porcelain v2 record per match: ordinary (1), renamed or copied (2),
+# unmerged (u), untracked (?) or ignored (!); header lines are skipped
+_PORCELAIN_V2 = re.compile(
+    rb"^(?:1 (?P<xy1>..) (?:\S+ ){6}"
+    rb"|2 (?P<xy2>..) (?:\S+ ){6}[RC]\d+ "
+    rb"|u (?P<xyu>..) (?:\S+ ){8}"
+    rb"|(?P<mark>[?!]) )"
+    rb"(?P<path>[^\t\n]*)(?:\t(?P<orig>[^\n]*))?$",
+    re.MULTILINE)
+
+@lru_cache(maxsize=32)
+def format_status(porcelain):
+    """
+    Turn `git status --porcelain=v2` records into short `XY path` lines
+
+    The raw bytes are matched with a precompiled pattern, so only the paths
+    are decoded and no intermediate line strings are built. Results are
+    cached, as an unchanged repository reports identical status bytes.
+
+    Args:
+        porcelain (bytes): Output of a porcelain v2 status query
+
+    Returns:
+        tuple: One display line per changed path
+    """
+    lines = []
+    for match in _PORCELAIN_V2.finditer(porcelain):
+        xy = match["xy1"] or match["xy2"] or match["xyu"] or match["mark"] * 2
+        path = os.fsdecode(match["path"])
+        if match["orig"] is not None:
+            path = f"{os.fsdecode(match['orig'])} -> {path}"
+        lines.append(f"{xy.decode()} {path}")
+    return tuple(lines)
@@ -4,55 +4,112 @@ Git Remote Operations Example
 This script demonstrates remote repository operations using Python.
 """
 
+import asyncio
 import subprocess
 import sys
 from pathlib import Path
 import os
 
+from git_runner import (READ_ONLY_ENV, STREAMING_ENV, ensure_repo, repo_env,
+                        run_git, run_git_async, run_git_reporting, stream_git)
+
+# Multiplex SSH: the first remote operation opens a master connection that
+# later pushes, pulls and clones reuse instead of repeating the handshake.
+# The socket lives under the user's own ~/.ssh, named by a hash of the
+# connection (%C), rather than at a predictable name in world-writable /tmp
+SSH_COMMAND = ("ssh -o ControlMaster=auto -o ControlPath=~/.ssh/cm-%C "
+               "-o ControlPersist=600")
+
+REMOTES_COMMAND = ["git", "remote", "-v"]
+REMOTE_BRANCHES_COMMAND = ["git", "for-each-ref", "--format=%(refname:short)",
+                           "refs/remotes"]
+
 class GitRemoteManager:
     def __init__(self, local_path):
         self.repo_path = Path(local_path)
+        self._work_tree = os.path.abspath(self.repo_path)
+        self._env = self._build_env()
+        self._git_env = repo_env(self._work_tree, self._env)
+        self._read_env = {**self._git_env, **READ_ONLY_ENV}
+        self._stream_env = {**self._git_env, **STREAMING_ENV}
         self.ensure_repo_exists()
 
-    def run_command(self, command, error_msg=None):
-        """Execute a Git command and return the output"""
-        try:
-            result = subprocess.run(command, cwd=self.repo_path,
-                                  capture_output=True, text=True, check=True)
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            if error_msg:
-                print(f"{error_msg}: {e.stderr}")
-            else:
-                print(f"Error executing command: {e.stderr}")
-            return None
+    def _build_env(self):
+        """Build the environment shared by every Git command of this manager"""
+        env = dict(os.environ)
+        if not self._ssh_configured(env):
+            env["GIT_SSH_COMMAND"] = SSH_COMMAND
+        # Request HTTP/2 for HTTPS remotes through environment-supplied
+        # config, appended after any entries the caller already set
+        count = int(env.get("GIT_CONFIG_COUNT", 0))
+        env[f"GIT_CONFIG_KEY_{count}"] = "http.version"
+        env[f"GIT_CONFIG_VALUE_{count}"] = "HTTP/2"
+        env["GIT_CONFIG_COUNT"] = str(count + 1)
+        return env
+
+    def _ssh_configured(self, env):
+        """Report whether the user has already chosen how git runs ssh"""
+        # GIT_SSH_COMMAND takes precedence over GIT_SSH and core.sshCommand,
+        # so injecting it would silently override either of them
+        if "GIT_SSH_COMMAND" in env or "GIT_SSH" in env:
+            return True
+        result = run_git(["git", "config", "core.sshCommand"],
+                         env=repo_env(self._work_tree, env), check=False)
+        return bool(result.stdout.strip())
+
+    def run_command(self, command, error_msg=None, capture=True):
+        """Execute a Git command and return the output
+
+        With capture=False stdout goes straight to the terminal, only stderr
+        is kept for error reporting, and an empty string is returned.
+        """
+        return run_git_reporting(command, self._git_env, error_msg,
+                                 stdout=subprocess.PIPE if capture else None)
+
+    def stream_command(self, command, error_msg=None, env=None):
+        """Execute a Git command, printing its output line by line as it arrives"""
+        return stream_git(command, env or self._git_env, error_msg)
+
+    async def run_command_async(self, command, error_msg=None, env=None):
+        """Execute a Git command without blocking the event loop"""
+        return await run_git_async(command, env or self._git_env, error_msg)
+
+    def run_silent(self, command, error_msg=None):
+        """Execute a Git command whose output is not needed and report success"""
+        return run_git_reporting(command, self._git_env, error_msg,
+                                 stdout=subprocess.DEVNULL, text=False) is not None
 
     def ensure_repo_exists(self):
         """Ensure the repository exists and is initialized"""
-        if not self.repo_path.exists():
-            self.repo_path.mkdir(parents=True)
-        if not (self.repo_path / ".git").exists():
-            self.run_command(["git", "init"])
-            print(f"Initialized new Git repository in {self.repo_path}")
-
-    def clone_repository(self, remote_url, branch=None):
-        """Clone a remote repository"""
+        ensure_repo(self._work_tree, self._init_repo)
+
+    def _init_repo(self):
+        """Initialize the repository and announce it"""
+        if not self.run_silent(["git", "init"]):
+            return False
+        print(f"Initialized new Git repository in {self.repo_path}")
+        return True
+
+    def clone_repository(self, remote_url, branch=None, tags=False):
+        """Clone the tip of a single branch of a remote repository"""
         if self.repo_path.exists() and any(self.repo_path.iterdir()):
             print(f"Directory {self.repo_path} is not empty")
             return False
 
-        cmd = ["git", "clone"]
+        # Shallow, blobless, single-branch clone: only the tip commit and
+        # its trees are fetched, and blobs are downloaded on demand
+        cmd = ["git", "clone", "--depth=1", "--filter=blob:none", "--single-branch"]
+        if not tags:
+            cmd.append("--no-tags")
         if branch:
             cmd.extend(["-b", branch])
         cmd.extend([remote_url, str(self.repo_path)])
 
-        try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
-            print(f"Successfully cloned {remote_url}")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"Failed to clone repository: {e.stderr}")
+        if run_git_reporting(cmd, self._env, "Failed to clone repository",
+                             stdout=None) is None:
             return False
+        print(f"Successfully cloned {remote_url}")
+        return True
 
     def add_remote(self, name, url):
         """Add a new remote"""
@@ -66,26 +123,44 @@ class GitRemoteManager:
     def list_remotes(self):
         """List all configured remotes"""
         print("\nConfigured remotes:")
-        self.run_command(["git", "remote", "-v"])
+        self.stream_command(REMOTES_COMMAND, "Failed to list remotes",
+                            env=self._stream_env)
 
     def push_to_remote(self, remote="origin", branch="master"):
         """Push changes to remote repository"""
         print(f"\nPushing to {remote}/{branch}")
         result = self.run_command(["git", "push", "-u", remote, branch],
-                                "Failed to push changes")
+                                "Failed to push changes", capture=False)
         return result is not None
 
     def pull_from_remote(self, remote="origin", branch="master"):
         """Pull changes from remote repository"""
         print(f"\nPulling from {remote}/{branch}")
         result = self.run_command(["git", "pull", remote, branch],
-                                "Failed to pull changes")
+                                "Failed to pull changes", capture=False)
         return result is not None
 
     def list_remote_branches(self):
         """List all remote branches"""
         print("\nRemote branches:")
-        self.run_command(["git", "branch", "-r"])
+        self.stream_command(REMOTE_BRANCHES_COMMAND, "Failed to list remote branches",
+                            env=self._stream_env)
+
+    async def _query_remote_overview(self):
+        """Run the remote and remote-branch listings concurrently"""
+        return await asyncio.gather(
+            self.run_command_async(REMOTES_COMMAND, env=self._read_env),
+            self.run_command_async(REMOTE_BRANCHES_COMMAND, env=self._read_env))
+
+    def show_remote_overview(self):
+        """List remotes and remote branches, querying git for both at once"""
+        remotes, branches = asyncio.run(self._query_remote_overview())
+        print("\nConfigured remotes:")
+        if remotes:
+            print(remotes)
+        print("\nRemote branches:")
+        if branches:
+            print(branches)
 
     def create_and_track_branch(self, branch_name, remote="origin"):
         """Create and track a remote branch"""
@@ -104,23 +179,20 @@ def demonstrate_remote_operations():
     # Add a remote repository
     remote_url = "https://github.com/makirwe/git-operations-demo.git"
     remote_manager.add_remote("origin", remote_url)
-    
-    # List configured remotes
-    remote_manager.list_remotes()
 
     # Create a new file
     test_file = remote_manager.repo_path / "remote_test.txt"
     test_file.write_text("Testing remote operations")
     
     # Commit changes
-    remote_manager.run_command(["git", "add", "."])
-    remote_manager.run_command(["git", "commit", "-m", "Add remote test file"])
+    remote_manager.run_silent(["git", "add", "--", test_file.name])
+    remote_manager.run_silent(["git", "commit", "-m", "Add remote test file"])
 
     # Push changes to remote
     remote_manager.push_to_remote()
 
-    # List remote branches
-    remote_manager.list_remote_branches()
+    # List remotes and remote branches
+    remote_manager.show_remote_overview()
 
     # Pull latest changes
     remote_manager.pull_from_remote()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Run All Git Demos
+This script runs the branching, conflict resolution and remote demos in
+parallel. Each demo works in its own repository directory, so they can
+safely run in separate processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from branch_operations import demonstrate_branching
+from conflict_resolution import demonstrate_conflict_resolution
+from remote_operations import demonstrate_remote_operations
+
+DEMOS = [
+    demonstrate_branching,
+    demonstrate_conflict_resolution,
+    demonstrate_remote_operations,
+]
+
+def main():
+    """Run every demo concurrently and report any that failed"""
+    workers = min(len(DEMOS), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(demo): demo.__name__ for demo in DEMOS}
+        for future, name in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"{name} failed: {e}")
+
+if __name__ == "__main__":
+    main()